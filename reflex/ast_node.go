@@ -84,7 +84,7 @@ func (a *ASTAncestorLookup) Node(ctx *Context, parents []Block) (Node, error) {
 					NodeBase: NodeBase{P: a.Pos},
 					Ref:      parent,
 				},
-				Attr: ctx.Attrs.Get(a.Attr),
+				Attr: attr,
 			}, nil
 		}
 	}
@@ -100,36 +100,37 @@ type ASTBlock struct {
 }
 
 func (a *ASTBlock) Node(ctx *Context, parents []Block) (Node, error) {
+	defs := dummyDefs(ctx, a.Defs)
 	n := &NodeBlock{
 		NodeBase: NodeBase{P: a.Pos},
-		Defs:     dummyDefs(ctx, a.Defs),
+		Defs:     defs,
 	}
-	if defs, err := instantiateDefs(ctx, append(parents, n), n, a.Defs); err != nil {
+	if err := instantiateDefs(ctx, append(parents, n), defs, a.Defs); err != nil {
 		return nil, err
-	} else {
-		n.Defs = defs
 	}
 	return n, nil
 }
 
-func dummyDefs[V any](ctx *Context, d map[string]V) DefMap {
-	m := map[Attr]Node{}
+// dummyDefs creates a mapping with all the keys of d but no values, so that
+// Defines() works on a node before its definitions are instantiated.
+func dummyDefs[V any](ctx *Context, d map[string]V) *FlatDefMap {
+	m := make(map[Attr]Node, len(d))
 	for k := range d {
 		m[ctx.Attrs.Get(k)] = nil
 	}
 	return NewFlatDefMap(m)
 }
 
-func instantiateDefs(ctx *Context, parents []Block, n Node, defs map[string]ASTNode) (DefMap, error) {
-	newDefs := map[Attr]Node{}
+// instantiateDefs fills in the values of a mapping created by dummyDefs.
+func instantiateDefs(ctx *Context, parents []Block, dst *FlatDefMap, defs map[string]ASTNode) error {
 	for k, v := range defs {
 		newNode, err := v.Node(ctx, parents)
 		if err != nil {
-			return nil, err
+			return err
 		}
-		newDefs[ctx.Attrs.Get(k)] = newNode
+		dst.m[ctx.Attrs.Get(k)] = newNode
 	}
-	return NewFlatDefMap(newDefs), nil
+	return nil
 }
 
 type ASTOverride struct {
@@ -144,19 +145,18 @@ func (a *ASTOverride) Node(ctx *Context, parents []Block) (Node, error) {
 	if err != nil {
 		return nil, err
 	}
+	defs := dummyDefs(ctx, a.Defs)
 	n := &NodeOverride{
 		NodeBase: NodeBase{P: a.Pos},
 		Base:     base,
-		Defs:     dummyDefs(ctx, a.Defs),
+		Defs:     defs,
 		Aliases:  map[Attr]Attr{},
 	}
 	for k, v := range a.Aliases {
 		n.Aliases[ctx.Attrs.Get(k)] = ctx.Attrs.Get(v)
 	}
-	if defs, err := instantiateDefs(ctx, append(parents, n), n, a.Defs); err != nil {
+	if err := instantiateDefs(ctx, append(parents, n), defs, a.Defs); err != nil {
 		return nil, err
-	} else {
-		n.Defs = defs
 	}
 	return n, nil
 }
@@ -173,21 +173,25 @@ func (a *ASTCall) Node(ctx *Context, parents []Block) (Node, error) {
 	if err != nil {
 		return nil, err
 	}
+	defs := dummyDefs(ctx, a.Defs)
 	n := &NodeOverride{
-		NodeBase: NodeBase{P: a.Pos},
-		Base:     base,
-		Defs:     dummyDefs(ctx, a.Defs),
-		Eager:    dummyDefs(ctx, a.Eager),
+		NodeBase:   NodeBase{P: a.Pos},
+		Base:       base,
+		Defs:       defs,
+		NoSelfRefs: true,
 	}
-	if defs, err := instantiateDefs(ctx, parents, n, a.Defs); err != nil {
+	if err := instantiateDefs(ctx, parents, defs, a.Defs); err != nil {
 		return nil, err
-	} else {
-		n.Defs = defs
 	}
-	if defs, err := instantiateDefs(ctx, parents, n, a.Eager); err != nil {
-		return nil, err
-	} else {
-		n.Eager = defs
+
+	// Most calls have no eager definitions, and leaving Eager nil saves
+	// cloning and evaluating an empty mapping every time the call is run.
+	if len(a.Eager) > 0 {
+		eager := dummyDefs(ctx, a.Eager)
+		n.Eager = eager
+		if err := instantiateDefs(ctx, parents, eager, a.Eager); err != nil {
+			return nil, err
+		}
 	}
 	return n, nil
 }
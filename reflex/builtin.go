@@ -82,8 +82,8 @@ func makeFallibleUnaryOp[T, R literal](ctx *Context, pos Pos, parent Node, fn fu
 		Op: newFnBuiltInOp(
 			ctx.Attrs,
 			[]string{"_inner"},
-			func(args map[string]Node) (Node, error) {
-				x := args["_inner"]
+			func(args []Node) (Node, error) {
+				x := args[0]
 				argValue, err := literalValue[T](x)
 				if err != nil {
 					return nil, err
@@ -119,9 +119,9 @@ func makeFallibleBinaryOp[T1, T2, R literal](ctx *Context, pos Pos, parent Node,
 			Op: newFnBuiltInOp(
 				ctx.Attrs,
 				[]string{"x._inner", "y._inner"},
-				func(args map[string]Node) (Node, error) {
-					x := args["x._inner"]
-					y := args["y._inner"]
+				func(args []Node) (Node, error) {
+					x := args[0]
+					y := args[1]
 					xValue, err := literalValue[T1](x)
 					if err != nil {
 						return nil, err
@@ -232,9 +232,9 @@ func intNode(ctx *Context) *NodeBlock {
 		ctx.Attrs.Get("float"): makeUnaryOp(ctx, pos, result, func(x int64) float64 {
 			return float64(x)
 		}),
-		ctx.Attrs.Get("select"):      makeSelectOrLogic("cond", newBuiltInSelect(ctx.Attrs)),
-		ctx.Attrs.Get("logical_and"): makeSelectOrLogic("x", newBuiltInLogic(ctx.Attrs, true)),
-		ctx.Attrs.Get("logical_or"):  makeSelectOrLogic("x", newBuiltInLogic(ctx.Attrs, false)),
+		ctx.Attrs.Get("select"):      makeSelectOrLogic("cond", newBuiltInSelect()),
+		ctx.Attrs.Get("logical_and"): makeSelectOrLogic("x", newBuiltInLogic(true)),
+		ctx.Attrs.Get("logical_or"):  makeSelectOrLogic("x", newBuiltInLogic(false)),
 	})
 	return result
 }
@@ -333,14 +333,14 @@ func createSubstrOrSlice(ctx *Context, pos Pos, parent Node, isStr bool) Node {
 			Op: newFnBuiltInOp(
 				ctx.Attrs,
 				[]string{"x._inner", "start._inner", "end._inner"},
-				func(args map[string]Node) (Node, error) {
-					x := args["x._inner"]
+				func(args []Node) (Node, error) {
+					x := args[0]
 
-					startIdx, err := literalValue[int64](args["start._inner"])
+					startIdx, err := literalValue[int64](args[1])
 					if err != nil {
 						return nil, err
 					}
-					endIdx, err := literalValue[int64](args["end._inner"])
+					endIdx, err := literalValue[int64](args[2])
 					if err != nil {
 						return nil, err
 					}
@@ -423,8 +423,8 @@ func strNode(ctx *Context) *NodeBlock {
 		Op: newFnBuiltInOp(
 			ctx.Attrs,
 			[]string{"_inner"},
-			func(args map[string]Node) (Node, error) {
-				xRaw := args["_inner"]
+			func(args []Node) (Node, error) {
+				xRaw := args[0]
 				x, ok := xRaw.(*NodeStrLit)
 				if !ok {
 					return nil, &BuiltInOpError{
@@ -461,8 +461,8 @@ func strNode(ctx *Context) *NodeBlock {
 			Op: newFnBuiltInOp(
 				ctx.Attrs,
 				[]string{"_inner"},
-				func(args map[string]Node) (Node, error) {
-					x := args["_inner"]
+				func(args []Node) (Node, error) {
+					x := args[0]
 					argValue, err := literalValue[string](x)
 					if err != nil {
 						return nil, err
@@ -534,62 +534,96 @@ type BuiltInOp interface {
 	Tell(context Node, result Node) (BuiltInOp, error)
 }
 
+// An effectfulOp is a BuiltInOp which may have side effects when it produces
+// a result, so the result can differ each time it is evaluated.
+type effectfulOp interface {
+	HasSideEffects() bool
+}
+
 type fnBuiltInOp struct {
-	Attrs *AttrTable
-	Paths []string
-	Fn    func(args map[string]Node) (Node, error)
-	Found map[string]Node
+	// AttrPaths holds the interned attributes of each argument path
+	// (e.g. "x._inner"), so that access chains can be built without
+	// splitting strings.
+	AttrPaths [][]Attr
+
+	// Fn receives one value per path, in the same order as AttrPaths.
+	Fn func(args []Node) (Node, error)
+
+	// Found holds the values for the first len(Found) paths, and is
+	// passed to Fn once every path has been evaluated.
+	Found []Node
+
+	// Effectful is set when Fn has side effects (e.g. I/O), so that
+	// results which depend on it are never memoized.
+	Effectful bool
 }
 
-func newFnBuiltInOp(attrs *AttrTable, paths []string, fn func(args map[string]Node) (Node, error)) *fnBuiltInOp {
+// newFnBuiltInOp creates an op which evaluates the given paths in its context
+// and then calls fn with their values.
+//
+// The evaluator memoizes results that depend on fn, so fn must have no side
+// effects. Use newEffectfulFnBuiltInOp for functions that do (e.g. I/O).
+func newFnBuiltInOp(attrs *AttrTable, paths []string, fn func(args []Node) (Node, error)) *fnBuiltInOp {
+	attrPaths := make([][]Attr, len(paths))
+	for i, path := range paths {
+		for _, part := range strings.Split(path, ".") {
+			attrPaths[i] = append(attrPaths[i], attrs.Get(part))
+		}
+	}
 	return &fnBuiltInOp{
-		Attrs: attrs,
-		Paths: paths,
-		Fn:    fn,
-		Found: map[string]Node{},
+		AttrPaths: attrPaths,
+		Fn:        fn,
 	}
 }
 
+// newEffectfulFnBuiltInOp is like newFnBuiltInOp, but for a function with
+// side effects.
+func newEffectfulFnBuiltInOp(attrs *AttrTable, paths []string, fn func(args []Node) (Node, error)) *fnBuiltInOp {
+	op := newFnBuiltInOp(attrs, paths, fn)
+	op.Effectful = true
+	return op
+}
+
+func (f *fnBuiltInOp) HasSideEffects() bool {
+	return f.Effectful
+}
+
 func (f *fnBuiltInOp) Next(context Node) (result Node, nextExpr Node, err error) {
-	for _, p := range f.Paths {
-		if _, ok := f.Found[p]; !ok {
-			// Create an access chain and return it.
-			accessChain := context
-			for _, part := range strings.Split(p, ".") {
-				accessChain = &NodeAccess{
-					NodeBase: NodeBase{P: context.Pos()},
-					Base:     accessChain,
-					Attr:     f.Attrs.Get(part),
-				}
+	if len(f.Found) < len(f.AttrPaths) {
+		// Create an access chain and return it.
+		accessChain := context
+		for _, attr := range f.AttrPaths[len(f.Found)] {
+			accessChain = &NodeAccess{
+				NodeBase: NodeBase{P: context.Pos()},
+				Base:     accessChain,
+				Attr:     attr,
 			}
-			return nil, accessChain, nil
 		}
+		return nil, accessChain, nil
 	}
 	out, err := f.Fn(f.Found)
 	return out, nil, err
 }
 
 func (f *fnBuiltInOp) Tell(context, result Node) (BuiltInOp, error) {
-	newResult := map[string]Node{}
-	for _, p := range f.Paths {
-		if v, ok := f.Found[p]; ok {
-			newResult[p] = v
-		} else {
-			newResult[p] = result
-			break
-		}
-	}
-	return &fnBuiltInOp{Attrs: f.Attrs, Paths: f.Paths, Fn: f.Fn, Found: newResult}, nil
+	newFound := make([]Node, len(f.Found)+1, len(f.AttrPaths))
+	copy(newFound, f.Found)
+	newFound[len(f.Found)] = result
+	return &fnBuiltInOp{
+		AttrPaths: f.AttrPaths,
+		Fn:        f.Fn,
+		Found:     newFound,
+		Effectful: f.Effectful,
+	}, nil
 }
 
 type builtInSelect struct {
-	Attrs    *AttrTable
 	SeenCond bool
-	NextAttr string
+	NextAttr Attr
 }
 
-func newBuiltInSelect(attrs *AttrTable) *builtInSelect {
-	return &builtInSelect{Attrs: attrs}
+func newBuiltInSelect() *builtInSelect {
+	return &builtInSelect{}
 }
 
 func (b *builtInSelect) Next(context Node) (result Node, nextExpr Node, err error) {
@@ -597,7 +631,7 @@ func (b *builtInSelect) Next(context Node) (result Node, nextExpr Node, err erro
 		return &NodeAccess{
 			NodeBase: NodeBase{P: context.Pos()},
 			Base:     context,
-			Attr:     b.Attrs.Get(b.NextAttr),
+			Attr:     b.NextAttr,
 		}, nil, nil
 	}
 	return nil, &NodeAccess{
@@ -605,9 +639,9 @@ func (b *builtInSelect) Next(context Node) (result Node, nextExpr Node, err erro
 		Base: &NodeAccess{
 			NodeBase: NodeBase{P: context.Pos()},
 			Base:     context,
-			Attr:     b.Attrs.Get("cond"),
+			Attr:     attrCond,
 		},
-		Attr: b.Attrs.Get("_inner"),
+		Attr: attrInner,
 	}, nil
 }
 
@@ -616,22 +650,21 @@ func (b *builtInSelect) Tell(context, result Node) (BuiltInOp, error) {
 	if err != nil {
 		return nil, err
 	}
-	nextAttr := "true"
+	nextAttr := attrTrue
 	if intValue == 0 {
-		nextAttr = "false"
+		nextAttr = attrFalse
 	}
-	return &builtInSelect{Attrs: b.Attrs, SeenCond: true, NextAttr: nextAttr}, nil
+	return &builtInSelect{SeenCond: true, NextAttr: nextAttr}, nil
 }
 
 type builtInLogic struct {
-	Attrs     *AttrTable
 	IsAnd     bool
 	XNode     Node
 	FinalNode Node
 }
 
-func newBuiltInLogic(attrs *AttrTable, isAnd bool) *builtInLogic {
-	return &builtInLogic{Attrs: attrs, IsAnd: isAnd}
+func newBuiltInLogic(isAnd bool) *builtInLogic {
+	return &builtInLogic{IsAnd: isAnd}
 }
 
 func (b *builtInLogic) Next(context Node) (result Node, nextExpr Node, err error) {
@@ -641,19 +674,19 @@ func (b *builtInLogic) Next(context Node) (result Node, nextExpr Node, err error
 		return nil, &NodeAccess{
 			NodeBase: NodeBase{P: context.Pos()},
 			Base:     b.XNode,
-			Attr:     b.Attrs.Get("_inner"),
+			Attr:     attrInner,
 		}, nil
 	}
 	return nil, &NodeAccess{
 		NodeBase: NodeBase{P: context.Pos()},
 		Base:     context,
-		Attr:     b.Attrs.Get("x"),
+		Attr:     attrX,
 	}, nil
 }
 
 func (b *builtInLogic) Tell(context, result Node) (BuiltInOp, error) {
 	if b.XNode == nil {
-		return &builtInLogic{Attrs: b.Attrs, IsAnd: b.IsAnd, XNode: result}, nil
+		return &builtInLogic{IsAnd: b.IsAnd, XNode: result}, nil
 	}
 	resultInt, err := literalValue[int64](result)
 	if err != nil {
@@ -664,8 +697,8 @@ func (b *builtInLogic) Tell(context, result Node) (BuiltInOp, error) {
 		nextNode = &NodeAccess{
 			NodeBase: NodeBase{P: context.Pos()},
 			Base:     context,
-			Attr:     b.Attrs.Get("y"),
+			Attr:     attrY,
 		}
 	}
-	return &builtInLogic{Attrs: b.Attrs, IsAnd: b.IsAnd, FinalNode: nextNode}, nil
+	return &builtInLogic{IsAnd: b.IsAnd, FinalNode: nextNode}, nil
 }
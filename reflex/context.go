@@ -39,57 +39,44 @@ func NewContext() *Context {
 
 // IntNode creates an integer with all of the built-in methods.
 func (c *Context) IntNode(pos Pos, lit int64) Node {
-	clone := c.intProto.Clone(nil).(*NodeBlock)
-	clone.P = pos
-	clone.Defs = NewOverrideDefMap(clone.Defs, NewFlatDefMap(map[Attr]Node{
-		c.Attrs.Get("_inner"): &NodeIntLit{
-			LitBase: LitBase{NodeBase: NodeBase{P: pos}},
-			Lit:     lit,
-		},
-	}))
-	clone.Defs = MaybeFlatten(clone.Defs)
-	return clone
+	return c.literalBlock(c.intProto, pos, &NodeIntLit{
+		LitBase: LitBase{NodeBase: NodeBase{P: pos}},
+		Lit:     lit,
+	})
 }
 
 // FloatNode creates a floar with all of the built-in methods.
 func (c *Context) FloatNode(pos Pos, lit float64) Node {
-	clone := c.floatProto.Clone(nil).(*NodeBlock)
-	clone.P = pos
-	clone.Defs = NewOverrideDefMap(clone.Defs, NewFlatDefMap(map[Attr]Node{
-		c.Attrs.Get("_inner"): &NodeFloatLit{
-			LitBase: LitBase{NodeBase: NodeBase{P: pos}},
-			Lit:     lit,
-		},
-	}))
-	clone.Defs = MaybeFlatten(clone.Defs)
-	return clone
+	return c.literalBlock(c.floatProto, pos, &NodeFloatLit{
+		LitBase: LitBase{NodeBase: NodeBase{P: pos}},
+		Lit:     lit,
+	})
 }
 
 // StrNode creates a string with all of the built-in methods.
 func (c *Context) StrNode(pos Pos, lit string) Node {
-	clone := c.strProto.Clone(nil).(*NodeBlock)
-	clone.P = pos
-	clone.Defs = NewOverrideDefMap(clone.Defs, NewFlatDefMap(map[Attr]Node{
-		c.Attrs.Get("_inner"): &NodeStrLit{
-			LitBase: LitBase{NodeBase: NodeBase{P: pos}},
-			Lit:     lit,
-		},
-	}))
-	clone.Defs = MaybeFlatten(clone.Defs)
-	return clone
+	return c.literalBlock(c.strProto, pos, &NodeStrLit{
+		LitBase: LitBase{NodeBase: NodeBase{P: pos}},
+		Lit:     lit,
+	})
 }
 
 // BytesNode creates a byte slice with all of the built-in methods.
 func (c *Context) BytesNode(pos Pos, lit []byte) Node {
-	clone := c.bytesProto.Clone(nil).(*NodeBlock)
+	return c.literalBlock(c.bytesProto, pos, &NodeBytesLit{
+		LitBase: LitBase{NodeBase: NodeBase{P: pos}},
+		Lit:     lit,
+	})
+}
+
+// literalBlock wraps a literal in a block with the methods from proto.
+//
+// The methods are cloned lazily from the prototype, so only the methods
+// which are actually accessed on the literal get instantiated.
+func (c *Context) literalBlock(proto *NodeBlock, pos Pos, inner Node) Node {
+	clone := proto.Clone(nil).(*NodeBlock)
 	clone.P = pos
-	clone.Defs = NewOverrideDefMap(clone.Defs, NewFlatDefMap(map[Attr]Node{
-		c.Attrs.Get("_inner"): &NodeBytesLit{
-			LitBase: LitBase{NodeBase: NodeBase{P: pos}},
-			Lit:     lit,
-		},
-	}))
-	clone.Defs = MaybeFlatten(clone.Defs)
+	clone.Defs = NewOverrideDefMap(clone.Defs, NewSingleDefMap(attrInner, inner))
 	return clone
 }
 
@@ -171,8 +158,26 @@ type AttrTable struct {
 	m map[string]Attr
 }
 
+// Attributes used directly by the interpreter and built-in ops.
+// These are registered first in every AttrTable, so they can be used
+// without looking up their names while evaluating.
+const (
+	attrInner Attr = iota
+	attrCond
+	attrTrue
+	attrFalse
+	attrX
+	attrY
+)
+
+var interpreterAttrNames = []string{"_inner", "cond", "true", "false", "x", "y"}
+
 func NewAttrTable() *AttrTable {
-	return &AttrTable{m: map[string]Attr{}}
+	res := &AttrTable{m: make(map[string]Attr, len(interpreterAttrNames))}
+	for _, name := range interpreterAttrNames {
+		res.Get(name)
+	}
+	return res
 }
 
 func (a *AttrTable) Get(name string) Attr {
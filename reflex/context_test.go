@@ -0,0 +1,26 @@
+package reflex
+
+import "testing"
+
+func TestAttrTableInterpreterAttrs(t *testing.T) {
+	expected := []struct {
+		Attr Attr
+		Name string
+	}{
+		{attrInner, "_inner"},
+		{attrCond, "cond"},
+		{attrTrue, "true"},
+		{attrFalse, "false"},
+		{attrX, "x"},
+		{attrY, "y"},
+	}
+	if len(interpreterAttrNames) != len(expected) {
+		t.Fatalf("expected %d predefined names but got %d", len(expected), len(interpreterAttrNames))
+	}
+	table := NewAttrTable()
+	for _, x := range expected {
+		if actual := table.Get(x.Name); actual != x.Attr {
+			t.Errorf("attribute %#v: expected %d but got %d", x.Name, x.Attr, actual)
+		}
+	}
+}
@@ -31,7 +31,7 @@ func (f *FlatDefMap) Depth() int {
 }
 
 func (f *FlatDefMap) Map(skip map[Attr]struct{}) map[Attr]Node {
-	r := map[Attr]Node{}
+	r := make(map[Attr]Node, len(f.m))
 	for k, v := range f.m {
 		if _, ok := skip[k]; ok {
 			continue
@@ -46,6 +46,35 @@ func (f *FlatDefMap) Get(k Attr) (Node, bool) {
 	return x, ok
 }
 
+// A SingleDefMap is a DefMap containing exactly one attribute.
+// It avoids allocating a Go map for small overrides like literal values.
+type SingleDefMap struct {
+	k Attr
+	v Node
+}
+
+func NewSingleDefMap(k Attr, v Node) *SingleDefMap {
+	return &SingleDefMap{k: k, v: v}
+}
+
+func (s *SingleDefMap) Depth() int {
+	return 1
+}
+
+func (s *SingleDefMap) Map(skip map[Attr]struct{}) map[Attr]Node {
+	if _, ok := skip[s.k]; ok {
+		return map[Attr]Node{}
+	}
+	return map[Attr]Node{s.k: s.v}
+}
+
+func (s *SingleDefMap) Get(k Attr) (Node, bool) {
+	if k == s.k {
+		return s.v, true
+	}
+	return nil, false
+}
+
 // A CloneDefMap clones the values in the inner mapping and propagates a replacement mapping
 // for back edges.
 type CloneDefMap struct {
@@ -61,10 +90,9 @@ func NewCloneDefMap(inner DefMap, repl *ReplaceMap) *CloneDefMap {
 			inner:      c.inner,
 			innerDepth: c.innerDepth,
 			repl:       c.repl.Updating(repl),
-			cache:      map[Attr]Node{},
 		}
 	}
-	return &CloneDefMap{inner: inner, innerDepth: inner.Depth(), repl: repl, cache: map[Attr]Node{}}
+	return &CloneDefMap{inner: inner, innerDepth: inner.Depth(), repl: repl}
 }
 
 func NewCloneDefMapSingle(inner DefMap, oldNode, newNode Node) *CloneDefMap {
@@ -78,11 +106,21 @@ func (c *CloneDefMap) Depth() int {
 }
 
 func (c *CloneDefMap) Map(skip map[Attr]struct{}) map[Attr]Node {
-	newMapping := map[Attr]Node{}
-	for k := range c.inner.Map(skip) {
-		newMapping[k], _ = c.Get(k)
+	// The inner map is owned by us, so we can replace its values in place.
+	mapping := c.inner.Map(skip)
+	if len(mapping) > 0 && c.cache == nil {
+		c.cache = make(map[Attr]Node, len(mapping))
 	}
-	return newMapping
+	for k, v := range mapping {
+		if result, ok := c.cache[k]; ok {
+			mapping[k] = result
+		} else {
+			newV := v.Clone(c.repl)
+			c.cache[k] = newV
+			mapping[k] = newV
+		}
+	}
+	return mapping
 }
 
 func (c *CloneDefMap) Get(k Attr) (Node, bool) {
@@ -91,6 +129,9 @@ func (c *CloneDefMap) Get(k Attr) (Node, bool) {
 	}
 	if v, ok := c.inner.Get(k); ok {
 		newV := v.Clone(c.repl)
+		if c.cache == nil {
+			c.cache = map[Attr]Node{}
+		}
 		c.cache[k] = newV
 		return newV, true
 	}
@@ -120,16 +161,16 @@ func (o *OverrideDefMap) Depth() int {
 }
 
 func (o *OverrideDefMap) Map(skip map[Attr]struct{}) map[Attr]Node {
-	newSkip := map[Attr]struct{}{}
-	for k, v := range skip {
-		newSkip[k] = v
+	// Both the skip set and the overrides map may be modified here, so the
+	// override keys are added to skip directly rather than to a copy.
+	if skip == nil {
+		skip = map[Attr]struct{}{}
 	}
-	result := map[Attr]Node{}
-	for k, v := range o.overrides.Map(skip) {
-		newSkip[k] = struct{}{}
-		result[k] = v
+	result := o.overrides.Map(skip)
+	for k := range result {
+		skip[k] = struct{}{}
 	}
-	for k, v := range o.inner.Map(newSkip) {
+	for k, v := range o.inner.Map(skip) {
 		result[k] = v
 	}
 	return result
@@ -44,7 +44,9 @@ func (g *GarbageCollector) Release(n Node) {
 }
 
 func (g *GarbageCollector) MaybeCollect() {
-	if !g.shouldCheck.CompareAndSwap(1, 0) {
+	// This is called on every evaluation step, so we avoid the cost of a
+	// compare-and-swap in the common case where no check is requested.
+	if g.shouldCheck.Load() == 0 || !g.shouldCheck.CompareAndSwap(1, 0) {
 		return
 	}
 	for n := range g.refCount {
@@ -38,6 +38,40 @@ func formatAvailable(attrs *AttrTable, node *NodeBlock) string {
 	return strings.Join(strs, ", ")
 }
 
+const pendingResultsSize = 8
+
+type pendingResult struct {
+	block *NodeBlock
+	attr  Attr
+}
+
+// pendingResults tracks the most recent attribute accesses whose values are
+// still being evaluated by a loop in Evaluate.
+//
+// Only a bounded number of accesses are tracked, so that long chains of
+// accesses (e.g. from recursion) do not keep every intermediate block alive.
+type pendingResults struct {
+	items [pendingResultsSize]pendingResult
+	size  int
+}
+
+func (p *pendingResults) Push(block *NodeBlock, attr Attr) {
+	p.items[p.size%pendingResultsSize] = pendingResult{block: block, attr: attr}
+	p.size++
+}
+
+// Resolve memoizes the final result for all of the tracked accesses.
+func (p *pendingResults) Resolve(result Node) Node {
+	n := p.size
+	if n > pendingResultsSize {
+		n = pendingResultsSize
+	}
+	for _, item := range p.items[:n] {
+		item.block.SetResult(item.attr, result)
+	}
+	return result
+}
+
 // Evaluate an expression until it becomes a literal or a block.
 func Evaluate(ctx *Context, node Node, trace GapStack, gc *GarbageCollector) (Node, error) {
 	if node == nil {
@@ -47,152 +81,260 @@ func Evaluate(ctx *Context, node Node, trace GapStack, gc *GarbageCollector) (No
 		gc = NewGarbageCollector()
 		defer gc.Shutdown()
 	}
+	e := &evaluator{ctx: ctx, gc: gc}
+	return e.Evaluate(node, trace)
+}
+
+// An evaluator holds the state shared by nested calls to Evaluate.
+//
+// Each kind of node is handled by its own method. A handler either returns
+// the next node to evaluate in place of the current one, or a final result.
+type evaluator struct {
+	ctx *Context
+	gc  *GarbageCollector
+
+	// effects counts the results produced by built-in ops with side
+	// effects, so that values which depended on them are not memoized.
+	effects int
+}
+
+func (e *evaluator) Evaluate(node Node, trace GapStack) (Node, error) {
+	var pending pendingResults
+	effects := e.effects
+
+	// Built-in ops report some errors without their own position, so they
+	// need the trace from before the push. The trace is large, so it is
+	// only copied for them rather than on every step.
+	var outerTrace GapStack
+
 	for {
-		gc.MaybeCollect()
-		pos := node.Pos()
-		newTrace := trace
-		newTrace.Push(pos)
-
-		nest := func(newNode Node, active ...Node) (Node, error) {
-			for _, x := range active {
-				gc.Retain(x)
-			}
-			gc.Retain(newNode)
-			gc.MaybeCollect()
-			res, err := Evaluate(ctx, newNode, newTrace, gc)
-			gc.Retain(res)
-			gc.MaybeCollect()
-			gc.Release(res)
-			gc.Release(newNode)
-			for _, x := range active {
-				gc.Release(x)
-			}
-			return res, err
-		}
-		doNext := func(newNode Node) {
-			if newNode == nil {
-				panic("nil node")
-			}
-			node = newNode
-			trace = newTrace
+		e.gc.MaybeCollect()
+		if _, ok := node.(*NodeBuiltInOp); ok {
+			outerTrace = trace
 		}
+		trace.Push(node.Pos())
 
+		var next, result Node
+		var err error
 		switch node := node.(type) {
 		case *NodeAccess:
-			b := node.Base
-			a := node.Attr
-			node = nil
-			baseRaw, err := Evaluate(ctx, b, newTrace, gc)
-			if err != nil {
-				return nil, err
+			next, result, err = e.access(node, &trace, &pending)
+		case *NodeOverride:
+			result, err = e.override(node, &trace)
+		case *NodeBackEdge:
+			if _, ok := node.Ref.(*NodeBlock); !ok {
+				panic(fmt.Sprintf("unexpected back edge type: %T", node.Ref))
 			}
-			base, ok := baseRaw.(*NodeBlock)
-			if !ok {
-				return nil, &InterpreterError{
-					Inner: fmt.Errorf("unexpected type for access base: %T", baseRaw),
-					Trace: newTrace,
-				}
+			result = node.Ref
+		case *NodeUnclonable:
+			next = node.Wrapped
+		case *NodeBuiltInOp:
+			next, err = e.builtInOp(node, &outerTrace, &trace)
+		case *NodeIntLit, *NodeFloatLit, *NodeStrLit, *NodeBytesLit, *NodeBlock:
+			result = node
+		default:
+			panic("unknown node type")
+		}
+		if err != nil {
+			return nil, err
+		} else if result != nil {
+			if e.effects != effects {
+				// Evaluating the result again would repeat its side effects.
+				return result, nil
 			}
-			obj, ok := base.Defs.Get(a)
+			return pending.Resolve(result), nil
+		} else if next == nil {
+			panic("nil node")
+		}
+		node = next
+	}
+}
+
+// nest evaluates a sub-expression while keeping the active nodes alive
+// for the garbage collector.
+func (e *evaluator) nest(trace *GapStack, newNode Node, active ...Node) (Node, error) {
+	for _, x := range active {
+		e.gc.Retain(x)
+	}
+	e.gc.Retain(newNode)
+	e.gc.MaybeCollect()
+	res, err := e.Evaluate(newNode, *trace)
+	e.gc.Retain(res)
+	e.gc.MaybeCollect()
+	e.gc.Release(res)
+	e.gc.Release(newNode)
+	for _, x := range active {
+		e.gc.Release(x)
+	}
+	return res, err
+}
+
+func (e *evaluator) access(
+	node *NodeAccess,
+	trace *GapStack,
+	pending *pendingResults,
+) (next Node, result Node, err error) {
+	a := node.Attr
+
+	// Back edges and blocks evaluate to a block immediately, so we avoid
+	// a nested Evaluate loop for these common bases.
+	var baseRaw Node
+	switch b := node.Base.(type) {
+	case *NodeBackEdge:
+		baseRaw = b.Ref
+	case *NodeBlock:
+		baseRaw = b
+	default:
+		baseRaw, err = e.Evaluate(node.Base, *trace)
+		if err != nil {
+			return nil, nil, err
+		}
+	}
+	base, ok := baseRaw.(*NodeBlock)
+	if !ok {
+		return nil, nil, &InterpreterError{
+			Inner: fmt.Errorf("unexpected type for access base: %T", baseRaw),
+			Trace: *trace,
+		}
+	}
+	if res, ok := base.Result(a); ok {
+		return nil, res, nil
+	}
+	obj, ok := base.Defs.Get(a)
+	if !ok {
+		return nil, nil, &InterpreterError{
+			Inner: fmt.Errorf(
+				"unable to access attribute: %#v (available: %s)",
+				e.ctx.Attrs.Name(a),
+				formatAvailable(e.ctx.Attrs, base),
+			),
+			Trace: *trace,
+		}
+	}
+	pending.Push(base, a)
+	return obj, nil, nil
+}
+
+func (e *evaluator) override(node *NodeOverride, trace *GapStack) (Node, error) {
+	base, err := e.nest(trace, node.Base, node)
+	if err != nil {
+		return nil, err
+	}
+	newBase, ok := base.Clone(nil).(*NodeBlock)
+	if !ok {
+		return nil, &InterpreterError{
+			Inner: fmt.Errorf("unexpected type for override base: %T", base),
+			Trace: *trace,
+		}
+	}
+	newBase.P = node.P
+	if node.NoSelfRefs {
+		newBase.Defs = NewOverrideDefMap(newBase.Defs, node.Defs)
+	} else {
+		newBase.Defs = NewOverrideDefMap(newBase.Defs, NewCloneDefMapSingle(node.Defs, node, newBase))
+	}
+
+	if len(node.Aliases) > 0 {
+		aliasMap := map[Attr]Node{}
+		for dst, src := range node.Aliases {
+			var ok bool
+			aliasMap[dst], ok = newBase.Defs.Get(src)
 			if !ok {
 				return nil, &InterpreterError{
 					Inner: fmt.Errorf(
-						"unable to access attribute: %#v (available: %s)",
-						ctx.Attrs.Name(a),
-						formatAvailable(ctx.Attrs, base),
+						"could not create alias from %s to %s because source attribute does not exist",
+						e.ctx.Attrs.Name(src),
+						e.ctx.Attrs.Name(dst),
 					),
-					Trace: newTrace,
+					Trace: *trace,
 				}
 			}
-			doNext(obj)
-		case *NodeOverride:
-			base, err := nest(node.Base, node)
+		}
+		newBase.Defs = NewOverrideDefMap(newBase.Defs, NewFlatDefMap(aliasMap))
+	}
+
+	if node.Eager != nil {
+		newDefs := map[Attr]Node{}
+		for k, v := range node.Eager.Map(nil) {
+			result, err := e.nest(trace, v, node, newBase)
 			if err != nil {
 				return nil, err
 			}
-			newBase, ok := base.Clone(nil).(*NodeBlock)
-			if !ok {
-				return nil, &InterpreterError{
-					Inner: fmt.Errorf("unexpected type for override base: %T", base),
-					Trace: newTrace,
-				}
-			}
-			newBase.P = node.P
-			newBase.Defs = NewOverrideDefMap(newBase.Defs, NewCloneDefMapSingle(node.Defs, node, newBase))
-
-			if len(node.Aliases) > 0 {
-				aliasMap := map[Attr]Node{}
-				for dst, src := range node.Aliases {
-					var ok bool
-					aliasMap[dst], ok = newBase.Defs.Get(src)
-					if !ok {
-						return nil, &InterpreterError{
-							Inner: fmt.Errorf(
-								"could not create alias from %s to %s because source attribute does not exist",
-								ctx.Attrs.Name(src),
-								ctx.Attrs.Name(dst),
-							),
-							Trace: newTrace,
-						}
-					}
-				}
-				newBase.Defs = NewOverrideDefMap(newBase.Defs, NewFlatDefMap(aliasMap))
+			resNode := &NodeUnclonable{
+				NodeBase: NodeBase{P: result.Pos()},
+				Wrapped:  result,
 			}
+			newDefs[k] = resNode
+			e.gc.Retain(resNode)
+		}
+		for _, v := range newDefs {
+			e.gc.Release(v)
+		}
+		if len(newDefs) > 0 {
+			newBase.Defs = NewOverrideDefMap(newBase.Defs, NewFlatDefMap(newDefs))
+		}
+	}
+	newBase.Defs = MaybeFlatten(newBase.Defs)
+	return newBase, nil
+}
 
-			if node.Eager != nil {
-				newDefs := map[Attr]Node{}
-				for k, v := range node.Eager.Map(nil) {
-					result, err := nest(v, node, newBase)
-					if err != nil {
-						return nil, err
-					}
-					resNode := &NodeUnclonable{
-						NodeBase: NodeBase{P: result.Pos()},
-						Wrapped:  result,
-					}
-					newDefs[k] = resNode
-					gc.Retain(resNode)
-				}
-				for _, v := range newDefs {
-					gc.Release(v)
-				}
-				if len(newDefs) > 0 {
-					newBase.Defs = NewOverrideDefMap(newBase.Defs, NewFlatDefMap(newDefs))
-				}
+func (e *evaluator) builtInOp(node *NodeBuiltInOp, trace, newTrace *GapStack) (Node, error) {
+	op := node.Op
+	for {
+		result, nextExpr, err := op.Next(node.Context)
+		if err != nil {
+			return nil, &InterpreterError{Inner: err, Trace: *trace}
+		}
+		if result != nil {
+			if eff, ok := op.(effectfulOp); ok && eff.HasSideEffects() {
+				e.effects++
 			}
-			newBase.Defs = MaybeFlatten(newBase.Defs)
-			return newBase, nil
-		case *NodeBackEdge:
-			if _, ok := node.Ref.(*NodeBlock); !ok {
-				panic(fmt.Sprintf("unexpected back edge type: %T", node.Ref))
+			return result, nil
+		}
+		nextResult, ok := resolveDirect(nextExpr)
+		if !ok {
+			nextResult, err = e.nest(newTrace, nextExpr, node)
+			if err != nil {
+				return nil, err
 			}
-			return node.Ref, nil
-		case *NodeUnclonable:
-			doNext(node.Wrapped)
-		case *NodeBuiltInOp:
-			op := node.Op
-			for {
-				result, nextExpr, err := op.Next(node.Context)
-				if err != nil {
-					return nil, &InterpreterError{Inner: err, Trace: trace}
-				}
-				if result != nil {
-					doNext(result)
-					break
-				}
-				nextResult, err := nest(nextExpr, node)
-				if err != nil {
-					return nil, err
-				}
-				op, err = op.Tell(node.Context, nextResult)
-				if err != nil {
-					return nil, &InterpreterError{Inner: err, Trace: newTrace}
-				}
+		}
+		op, err = op.Tell(node.Context, nextResult)
+		if err != nil {
+			return nil, &InterpreterError{Inner: err, Trace: *newTrace}
+		}
+	}
+}
+
+// resolveDirect resolves an access chain, such as the x._inner arguments
+// of built-in ops, when every step is already a value and no evaluation is
+// required.
+//
+// If the chain needs to be evaluated, false is returned.
+func resolveDirect(node Node) (Node, bool) {
+	switch node := node.(type) {
+	case *NodeIntLit, *NodeFloatLit, *NodeStrLit, *NodeBytesLit, *NodeBlock:
+		return node, true
+	case *NodeBackEdge:
+		if block, ok := node.Ref.(*NodeBlock); ok {
+			return block, true
+		}
+	case *NodeAccess:
+		base, ok := resolveDirect(node.Base)
+		if !ok {
+			return nil, false
+		}
+		block, ok := base.(*NodeBlock)
+		if !ok {
+			return nil, false
+		}
+		if res, ok := block.Result(node.Attr); ok {
+			return res, true
+		}
+		if obj, ok := block.Defs.Get(node.Attr); ok {
+			if _, isAccess := obj.(*NodeAccess); !isAccess {
+				return resolveDirect(obj)
 			}
-		case *NodeIntLit, *NodeFloatLit, *NodeStrLit, *NodeBytesLit, *NodeBlock:
-			return node, nil
-		default:
-			panic("unknown node type")
 		}
 	}
+	return nil, false
 }
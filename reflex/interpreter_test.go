@@ -224,7 +224,80 @@ func TestInterpreterDoubleOverride(t *testing.T) {
 	testInterpreterOutput[int64](t, code, 123)
 }
 
+func TestInterpreterCallArgClones(t *testing.T) {
+	// The block passed to f refers to the enclosing block, so it must see
+	// each clone of Outer separately even though call arguments are not
+	// cloned when the call is applied.
+	code := `
+    Outer = {
+      v = 1
+      f = {
+        result = g.w
+      }
+      result = f(g={
+        w = ^.v
+      })!
+    }
+    result = Outer(v=10)! * 100 + Outer(v=20)! + Outer!
+  `
+	testInterpreterOutput[int64](t, code, 1021)
+}
+
+func TestInterpreterBuiltInArgs(t *testing.T) {
+	// Arguments which are not plain values must still be evaluated.
+	code := `
+    x = 3 + 5(z=1)
+    y = 3 + "hi".len
+    z = {
+      w = 7
+      result = 3 + @(w=2).w
+    }
+    result = x * 100 + y * 10 + z!
+  `
+	testInterpreterOutput[int64](t, code, 855)
+}
+
+func TestInterpreterBuiltInArgError(t *testing.T) {
+	interpErr := testInterpreterError(t, "x = {a = 1}\nresult = 3 + x\n")
+	expectedMsg := `unable to access attribute: "_inner" (available: "a")`
+	if interpErr.Inner.Error() != expectedMsg {
+		t.Errorf("unexpected error: %s", interpErr.Inner)
+	}
+	expectedTrace := []Pos{
+		{File: "interpreter"},
+		{File: "file", Line: 2, Col: 12},
+		{File: "<builtin/int>"},
+		{File: "file", Line: 2, Col: 12},
+	}
+	actualTrace := interpErr.Trace.Slice()
+	if len(actualTrace) != len(expectedTrace) {
+		t.Fatalf("unexpected trace: %v", actualTrace)
+	}
+	for i, x := range expectedTrace {
+		if actualTrace[i] != x {
+			t.Fatalf("unexpected trace: %v", actualTrace)
+		}
+	}
+}
+
+func TestInterpreterComputedValuePos(t *testing.T) {
+	// Errors about values computed by built-in ops point at the expression
+	// which computed them.
+	interpErr := testInterpreterError(t, "x = 1 + 2\nresult = \"a\" + x\n")
+	if msg := interpErr.Inner.Error(); msg != "value is not a string at file:1:5" {
+		t.Errorf("unexpected error: %s", msg)
+	}
+	interpErr = testInterpreterError(t, "code = 7\nresult = code.str.panic\n")
+	if msg := interpErr.Inner.Error(); msg != "7 at file:1:8" {
+		t.Errorf("unexpected error: %s", msg)
+	}
+}
+
 func testInterpreterOutput[T literal](t *testing.T, code string, expected T) {
+	testInterpreterOutputContext(t, NewContext(), code, expected)
+}
+
+func testInterpreterOutputContext[T literal](t *testing.T, ctx *Context, code string, expected T) {
 	toks, err := Tokenize("file", code)
 	if err != nil {
 		t.Fatalf("failed to tokenize: %s", err)
@@ -233,7 +306,6 @@ func testInterpreterOutput[T literal](t *testing.T, code string, expected T) {
 	if err != nil {
 		t.Fatalf("failed to parse: %s", err)
 	}
-	ctx := NewContext()
 	node, err := parsed.Node(ctx, nil)
 	if err != nil {
 		t.Fatalf("failed to node-ify: %s", err)
@@ -276,3 +348,97 @@ func testInterpreterOutput[T literal](t *testing.T, code string, expected T) {
 		panic("unknown type")
 	}
 }
+
+func testInterpreterError(t *testing.T, code string) *InterpreterError {
+	toks, err := Tokenize("file", code)
+	if err != nil {
+		t.Fatalf("failed to tokenize: %s", err)
+	}
+	parsed, err := Parse(toks)
+	if err != nil {
+		t.Fatalf("failed to parse: %s", err)
+	}
+	ctx := NewContext()
+	node, err := parsed.Node(ctx, nil)
+	if err != nil {
+		t.Fatalf("failed to node-ify: %s", err)
+	}
+	access := &NodeAccess{
+		NodeBase: NodeBase{P: Pos{File: "interpreter"}},
+		Base:     node,
+		Attr:     ctx.Attrs.Get("result"),
+	}
+	_, err = Evaluate(ctx, access, NewGapStack(), nil)
+	if err == nil {
+		t.Fatal("expected an error")
+	}
+	interpErr, ok := err.(*InterpreterError)
+	if !ok {
+		t.Fatalf("unexpected error type: %T", err)
+	}
+	return interpErr
+}
+
+func BenchmarkInterpreterRecursion(b *testing.B) {
+	code := `
+    IntSum = {
+      i = 0
+      sum = 0
+      result = i
+        ? @(i := i - 1, sum := sum + i)!
+        : sum
+    }
+
+    result = IntSum(i=1000)!
+  `
+	benchmarkInterpreter(b, code)
+}
+
+func BenchmarkInterpreterFactor(b *testing.B) {
+	code := `
+    factor = {
+      f = 2
+      next_result = @(f:=f + 1)!
+      result = x % f ? next_result : f
+    }
+    result = factor[x=10403]!
+  `
+	benchmarkInterpreter(b, code)
+}
+
+func BenchmarkInterpreterList(b *testing.B) {
+	code := `
+		List = "stdlib/collections".import.List
+		result = List.range(start=0 end=64)!.map(fn={
+			result = x * x
+		})!.sum!
+	`
+	benchmarkInterpreter(b, code)
+}
+
+func benchmarkInterpreter(b *testing.B, code string) {
+	toks, err := Tokenize("file", code)
+	if err != nil {
+		b.Fatalf("failed to tokenize: %s", err)
+	}
+	parsed, err := Parse(toks)
+	if err != nil {
+		b.Fatalf("failed to parse: %s", err)
+	}
+	b.ResetTimer()
+	for i := 0; i < b.N; i++ {
+		ctx := NewContext()
+		node, err := parsed.Node(ctx, nil)
+		if err != nil {
+			b.Fatalf("failed to node-ify: %s", err)
+		}
+		access := &NodeAccess{
+			NodeBase: NodeBase{P: Pos{File: "interpreter"}},
+			Base:     node,
+			Attr:     ctx.Attrs.Get("result"),
+		}
+		if _, err := Evaluate(ctx, access, NewGapStack(), nil); err != nil {
+			b.Fatalf("failed to evaluate: %s", err)
+		}
+	}
+}
@@ -31,50 +31,47 @@ func (e *LexError) Error() string {
 }
 
 type Tokenizer struct {
-	src        []rune
-	file       string
-	i          int
-	line, col  int
-	singles    map[rune]string
-	doubles    map[string]string
-	whitespace map[rune]struct{}
+	src       []rune
+	file      string
+	i         int
+	line, col int
 }
 
-func NewTokenizer(filename, src string) *Tokenizer {
-	t := &Tokenizer{
-		src:        []rune(src),
-		i:          0,
-		file:       filename,
-		line:       1,
-		col:        1,
-		singles:    make(map[rune]string),
-		doubles:    make(map[string]string),
-		whitespace: make(map[rune]struct{}),
-	}
+// Token types for single-character punctuation.
+var tokenizerSingles = map[rune]string{
+	'{': "{", '}': "}", '[': "[", ']': "]", '(': "(", ')': ")",
+	'.': ".", '=': "=", ',': ",", '+': "+", '-': "-", '/': "/",
+	'*': "*", ':': ":", '?': "?", '<': "<", '>': ">", '%': "%",
+	'^': "PARENT",
+	'@': "SELF",
+	'!': "UNWRAP",
+}
 
-	// punctuation = set("{}[]().=,+-/*:?<>%")
-	punctuation := "{}[]().=,+-/*:?<>%"
-	for _, ch := range punctuation {
-		t.singles[ch] = string(ch)
-	}
-	// extra singles
-	t.singles['^'] = "PARENT"
-	t.singles['@'] = "SELF"
-	t.singles['!'] = "UNWRAP"
-
-	// double_punct = ["<-", ":=", "==", "<=", ">=", "!=", "||", "&&"]
-	doublePunct := []string{"<-", ":=", "==", "<=", ">=", "!=", "||", "&&"}
-	t.doubles["^^"] = "ANCESTOR"
-	for _, s := range doublePunct {
-		t.doubles[s] = s
-	}
+// Token types for two-character punctuation.
+var tokenizerDoubles = map[[2]rune]string{
+	{'^', '^'}: "ANCESTOR",
+	{'<', '-'}: "<-",
+	{':', '='}: ":=",
+	{'=', '='}: "==",
+	{'<', '='}: "<=",
+	{'>', '='}: ">=",
+	{'!', '='}: "!=",
+	{'|', '|'}: "||",
+	{'&', '&'}: "&&",
+}
 
-	// whitespace = set(" \t\r\n")
-	for _, ch := range " \t\r\n" {
-		t.whitespace[ch] = struct{}{}
-	}
+func isTokenizerWhitespace(ch rune) bool {
+	return ch == ' ' || ch == '\t' || ch == '\r' || ch == '\n'
+}
 
-	return t
+func NewTokenizer(filename, src string) *Tokenizer {
+	return &Tokenizer{
+		src:  []rune(src),
+		i:    0,
+		file: filename,
+		line: 1,
+		col:  1,
+	}
 }
 
 // Tokenize is the Go equivalent of the top-level `tokenize(src: str)` function.
@@ -92,12 +89,12 @@ func (t *Tokenizer) Tokens() ([]Token, error) {
 	var result []Token
 
 	for t.cur() != 0 {
-		x, err := t.nextToken()
+		x, ok, err := t.nextToken()
 		if err != nil {
 			return nil, err
 		}
-		if x != nil {
-			result = append(result, *x)
+		if ok {
+			result = append(result, x)
 		}
 	}
 
@@ -110,43 +107,50 @@ func (t *Tokenizer) Tokens() ([]Token, error) {
 }
 
 func (t *Tokenizer) peekDouble() (string, string, bool) {
-	ch := t.cur()
-	if t.peek() == 0 {
+	if t.i+1 >= len(t.src) {
+		return "", "", false
+	}
+	key := [2]rune{t.src[t.i], t.src[t.i+1]}
+	typ, ok := tokenizerDoubles[key]
+	if !ok {
 		return "", "", false
 	}
-	s := string([]rune{ch, t.peek()})
-	typ, ok := t.doubles[s]
-	return s, typ, ok
+	return string(key[:]), typ, true
 }
 
 // nextToken corresponds to Tokenizer.next_token(self).
-func (t *Tokenizer) nextToken() (*Token, error) {
+//
+// Tokens are returned by value so that they are not allocated separately
+// before being appended to the result. The bool result is false when no
+// token was produced (e.g. for whitespace and comments).
+func (t *Tokenizer) nextToken() (Token, bool, error) {
 	ch := t.cur()
 	if ch == 0 {
-		return nil, nil
-	} else if _, ok := t.whitespace[ch]; ok {
+		return Token{}, false, nil
+	} else if isTokenizerWhitespace(ch) {
 		t.adv(1)
-		return nil, nil
+		return Token{}, false, nil
 	} else if s, typ, ok := t.peekDouble(); ok {
-		res := &Token{
+		res := Token{
 			Typ: typ,
 			Val: s,
 			Pos: t.Pos(),
 		}
 		t.adv(2)
-		return res, nil
+		return res, true, nil
 	} else if unicode.IsDigit(ch) {
-		return t.parseNumericLiteral(), nil
-	} else if typ, ok := t.singles[ch]; ok {
-		res := &Token{
+		return t.parseNumericLiteral(), true, nil
+	} else if typ, ok := tokenizerSingles[ch]; ok {
+		res := Token{
 			Typ: typ,
 			Val: string(ch),
 			Pos: t.Pos(),
 		}
 		t.adv(1)
-		return res, nil
+		return res, true, nil
 	} else if ch == '"' || ch == '\'' {
-		return t.parseStringLit()
+		tok, err := t.parseStringLit()
+		return tok, true, err
 	} else if ch == '#' {
 		for {
 			x := t.cur()
@@ -155,11 +159,11 @@ func (t *Tokenizer) nextToken() (*Token, error) {
 			}
 			t.adv(1)
 		}
-		return nil, nil
+		return Token{}, false, nil
 	} else if unicode.IsLetter(ch) || ch == '_' {
-		return t.parseIdentifier(), nil
+		return t.parseIdentifier(), true, nil
 	}
-	return nil, &LexError{
+	return Token{}, false, &LexError{
 		Msg: fmt.Sprintf("Unexpected %q", ch), Pos: t.Pos(),
 	}
 }
@@ -172,11 +176,8 @@ func (t *Tokenizer) cur() rune {
 }
 
 func (t *Tokenizer) adv(n int) {
-	for step := 0; step < n; step++ {
-		if t.cur() == 0 {
-			break
-		}
-		if t.cur() == '\n' {
+	for step := 0; step < n && t.i < len(t.src); step++ {
+		if t.src[t.i] == '\n' {
 			t.line++
 			t.col = 1
 		} else {
@@ -193,10 +194,10 @@ func (t *Tokenizer) peek() rune {
 	return t.src[t.i+1]
 }
 
-func (t *Tokenizer) parseStringLit() (*Token, error) {
+func (t *Tokenizer) parseStringLit() (Token, error) {
 	ch := t.cur()
 	if ch != '"' && ch != '\'' {
-		return nil, fmt.Errorf("parseStringLit called at non-quote character %q", ch)
+		return Token{}, fmt.Errorf("parseStringLit called at non-quote character %q", ch)
 	}
 
 	startPos := t.Pos()
@@ -236,13 +237,13 @@ func (t *Tokenizer) parseStringLit() (*Token, error) {
 		} else if c == quote {
 			// go past closing quote
 			t.adv(1)
-			return &Token{
+			return Token{
 				Typ: "STRING",
 				Val: string(buf),
 				Pos: startPos,
 			}, nil
 		} else if c == '\n' {
-			return nil, &LexError{
+			return Token{}, &LexError{
 				Msg: "Unterminated string",
 				Pos: startPos,
 			}
@@ -251,75 +252,68 @@ func (t *Tokenizer) parseStringLit() (*Token, error) {
 		}
 	}
 
-	return nil, &LexError{Msg: "Unterminated string", Pos: startPos}
+	return Token{}, &LexError{Msg: "Unterminated string", Pos: startPos}
 }
 
-func (t *Tokenizer) parseNumericLiteral() *Token {
+func (t *Tokenizer) parseNumericLiteral() Token {
 	startPos := t.Pos()
+	start := t.i
 
 	if !unicode.IsDigit(t.cur()) {
 		panic("parseNumericLiteral called at non-int start")
 	}
 
-	var buf []rune
-
 	// integer part
 	for unicode.IsDigit(t.cur()) {
-		buf = append(buf, t.cur())
 		t.adv(1)
 	}
 
 	// floating point literal: digits '.' digits
 	// require at least one digit after the dot
 	if t.cur() == '.' && unicode.IsDigit(t.peek()) {
-		buf = append(buf, '.') // consume the dot
-		t.adv(1)
+		t.adv(1) // consume the dot
 
 		for unicode.IsDigit(t.cur()) {
-			buf = append(buf, t.cur())
 			t.adv(1)
 		}
 
-		return &Token{
+		return Token{
 			Typ: "FLOAT",
-			Val: string(buf),
+			Val: string(t.src[start:t.i]),
 			Pos: startPos,
 		}
 	}
 
 	// plain integer literal
-	return &Token{
+	return Token{
 		Typ: "INT",
-		Val: string(buf),
+		Val: string(t.src[start:t.i]),
 		Pos: startPos,
 	}
 }
 
-func (t *Tokenizer) parseIdentifier() *Token {
+func (t *Tokenizer) parseIdentifier() Token {
 	startPos := t.Pos()
+	start := t.i
 
 	ch := t.cur()
 	if !(unicode.IsLetter(ch) || ch == '_') {
 		panic("unexpected start")
 	}
-
-	var buf []rune
-	buf = append(buf, ch)
 	t.adv(1)
 
 	for {
 		ch = t.cur()
 		if unicode.IsLetter(ch) || unicode.IsDigit(ch) || ch == '_' {
-			buf = append(buf, ch)
 			t.adv(1)
 		} else {
 			break
 		}
 	}
 
-	return &Token{
+	return Token{
 		Typ: "IDENT",
-		Val: string(buf),
+		Val: string(t.src[start:t.i]),
 		Pos: startPos,
 	}
 }
@@ -27,9 +27,14 @@ type NodeAccess struct {
 }
 
 func (n *NodeAccess) Clone(r *ReplaceMap) Node {
+	newBase := n.Base.Clone(r)
+	if newBase == n.Base {
+		// Nothing beneath this node refers to a replaced node.
+		return n
+	}
 	return &NodeAccess{
 		NodeBase: n.NodeBase,
-		Base:     n.Base.Clone(r),
+		Base:     newBase,
 		Attr:     n.Attr,
 	}
 }
@@ -44,6 +49,9 @@ func (n *NodeAccess) Flatten() {
 type NodeBlock struct {
 	NodeBase
 	Defs DefMap
+
+	// Evaluated values of attributes, filled in by the interpreter.
+	results map[Attr]Node
 }
 
 func (n *NodeBlock) Clone(r *ReplaceMap) Node {
@@ -53,6 +61,26 @@ func (n *NodeBlock) Clone(r *ReplaceMap) Node {
 	return newNode
 }
 
+// Result gets the memoized evaluation result of an attribute, if there is one.
+func (n *NodeBlock) Result(attr Attr) (Node, bool) {
+	x, ok := n.results[attr]
+	return x, ok
+}
+
+// SetResult memoizes the evaluation result of an attribute.
+//
+// A block's definitions are only replaced before it is evaluated (e.g. when
+// setting up built-in modules) or with equivalent ones (e.g. by Flatten), so
+// the result of an attribute is the same every time it is evaluated, unless
+// the evaluation ran a built-in op with side effects. The interpreter does
+// not memoize results in the latter case.
+func (n *NodeBlock) SetResult(attr Attr, result Node) {
+	if n.results == nil {
+		n.results = map[Attr]Node{}
+	}
+	n.results[attr] = result
+}
+
 func (n *NodeBlock) Defines(attr Attr) bool {
 	_, ok := n.Defs.Get(attr)
 	return ok
@@ -75,13 +103,19 @@ type NodeOverride struct {
 	Defs    DefMap
 	Eager   DefMap
 	Aliases map[Attr]Attr
+
+	// NoSelfRefs is set when no definition can refer back to the override
+	// itself (as for calls), so definitions need not be cloned when the
+	// override is applied.
+	NoSelfRefs bool
 }
 
 func (n *NodeOverride) Clone(r *ReplaceMap) Node {
 	newNode := &NodeOverride{
-		NodeBase: n.NodeBase,
-		Base:     n.Base.Clone(r),
-		Aliases:  n.Aliases,
+		NodeBase:   n.NodeBase,
+		Base:       n.Base.Clone(r),
+		Aliases:    n.Aliases,
+		NoSelfRefs: n.NoSelfRefs,
 	}
 	newMap := r.Inserting(n, newNode)
 	newNode.Defs = MaybeFlatten(NewCloneDefMap(n.Defs, newMap))
@@ -95,8 +129,10 @@ func (n *NodeOverride) Defines(attr Attr) bool {
 	if _, ok := n.Defs.Get(attr); ok {
 		return true
 	}
-	if _, ok := n.Eager.Get(attr); ok {
-		return true
+	if n.Eager != nil {
+		if _, ok := n.Eager.Get(attr); ok {
+			return true
+		}
 	}
 	if _, ok := n.Aliases[attr]; ok {
 		return true
@@ -14,20 +14,28 @@ func (p *ParseError) Error() string {
 	return fmt.Sprintf("%s at %s", p.Msg, p.Pos)
 }
 
-var binaryOpPrecedence = map[string]int{
-	"||": 3,
-	"&&": 4,
-	"==": 5,
-	"!=": 5,
-	"<=": 7,
-	">=": 7,
-	"<":  7,
-	">":  7,
-	"+":  10,
-	"-":  10,
-	"*":  20,
-	"/":  20,
-	"%":  20,
+// A binaryOp describes how a binary operator token is parsed.
+type binaryOp struct {
+	Precedence int
+	Name       string
+}
+
+// binaryOps maps operator tokens to their precedence and method name, so
+// that the parser needs a single lookup per operator.
+var binaryOps = map[string]binaryOp{
+	"||": {3, "logical_or"},
+	"&&": {4, "logical_and"},
+	"==": {5, "eq"},
+	"!=": {5, "ne"},
+	"<=": {7, "le"},
+	">=": {7, "ge"},
+	"<":  {7, "lt"},
+	">":  {7, "gt"},
+	"+":  {10, "add"},
+	"-":  {10, "sub"},
+	"*":  {20, "mul"},
+	"/":  {20, "div"},
+	"%":  {20, "mod"},
 }
 
 func Parse(toks []Token) (ASTNode, error) {
@@ -35,23 +43,19 @@ func Parse(toks []Token) (ASTNode, error) {
 }
 
 type Parser struct {
-	toks []*Token
+	toks []Token
 	k    int
 }
 
 func NewParser(toks []Token) *Parser {
-	tokPtrs := make([]*Token, len(toks))
-	for i := range toks {
-		tokPtrs[i] = &toks[i]
-	}
-	return &Parser{toks: tokPtrs}
+	return &Parser{toks: toks}
 }
 
 func (p *Parser) peek() *Token {
 	if p.k >= len(p.toks) {
-		return p.toks[len(p.toks)-1]
+		return &p.toks[len(p.toks)-1]
 	}
-	return p.toks[p.k]
+	return &p.toks[p.k]
 }
 
 func (p *Parser) match(types ...string) *Token {
@@ -177,33 +181,18 @@ func (p *Parser) parseBinary(minPrec int) (ASTNode, error) {
 	for {
 		t := p.peek()
 		op := t.Typ
-		prec, ok := binaryOpPrecedence[op]
-		if !ok || prec < minPrec {
+		info, ok := binaryOps[op]
+		if !ok || info.Precedence < minPrec {
 			break
 		}
 		p.k += 1
-		rhs, err := p.parseBinary(prec + 1)
+		rhs, err := p.parseBinary(info.Precedence + 1)
 		if err != nil {
 			return nil, err
 		}
-		opName := map[string]string{
-			"==": "eq",
-			"!=": "ne",
-			"<":  "lt",
-			">":  "gt",
-			">=": "ge",
-			"<=": "le",
-			"+":  "add",
-			"-":  "sub",
-			"/":  "div",
-			"*":  "mul",
-			"%":  "mod",
-			"&&": "logical_and",
-			"||": "logical_or",
-		}[op]
 		node = &ASTBinaryOp{
 			Pos:    t.Pos,
-			OpName: opName,
+			OpName: info.Name,
 			X:      node,
 			Y:      rhs,
 		}
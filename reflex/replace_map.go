@@ -1,10 +1,19 @@
 package reflex
 
+type replacement struct {
+	old Node
+	new Node
+}
+
 // A mapping from old pointers to new pointers, which follows replacements
 // upon insertion.
 // The nil value is an empty map, and you can still call methods on it.
+//
+// Replacement maps typically hold only a handful of entries (one per block
+// being cloned), so they are stored as a flat list and searched linearly,
+// which is cheaper to build and copy than a Go map.
 type ReplaceMap struct {
-	m map[Node]Node
+	entries []replacement
 }
 
 // Get checks if the node is in the map, and if so, returns its value.
@@ -12,8 +21,22 @@ func (r *ReplaceMap) Get(k Node) (Node, bool) {
 	if r == nil {
 		return nil, false
 	}
-	x, ok := r.m[k]
-	return x, ok
+	for _, e := range r.entries {
+		if e.old == k {
+			return e.new, true
+		}
+	}
+	return nil, false
+}
+
+// hasValue checks if any entry in the map replaces a node with v.
+func (r *ReplaceMap) hasValue(v Node) bool {
+	for _, e := range r.entries {
+		if e.new == v {
+			return true
+		}
+	}
+	return false
 }
 
 // Updating adds the updates with higher precedence than w, and
@@ -25,43 +48,50 @@ func (w *ReplaceMap) Updating(update *ReplaceMap) *ReplaceMap {
 		return w
 	}
 
-	inverse := make(map[Node][]Node, len(w.m)+len(update.m))
-	mapping := make(map[Node]Node, len(w.m)+len(update.m))
-	for _, d := range []*ReplaceMap{w, update} {
-		for k, v := range d.m {
-			if oldNodes := inverse[k]; d == update && len(oldNodes) > 0 {
-				delete(inverse, k)
-				for _, oldNode := range oldNodes {
-					mapping[oldNode] = v
-					inverse[v] = append(inverse[v], oldNode)
-				}
-			} else {
-				mapping[k] = v
-				inverse[v] = append(inverse[v], k)
+	entries := make([]replacement, 0, len(w.entries)+len(update.entries))
+	for _, e := range w.entries {
+		if newV, ok := update.Get(e.new); ok {
+			e.new = newV
+		}
+		entries = append(entries, e)
+	}
+
+	// Replacements in update whose keys are values of w have been applied
+	// by following the chain, and are not kept as entries of their own.
+UpdateLoop:
+	for _, e := range update.entries {
+		if w.hasValue(e.old) {
+			continue
+		}
+		for i, existing := range entries[:len(w.entries)] {
+			if existing.old == e.old {
+				entries[i].new = e.new
+				continue UpdateLoop
 			}
 		}
+		entries = append(entries, e)
 	}
-	return &ReplaceMap{m: mapping}
+	return &ReplaceMap{entries: entries}
 }
 
 // Inserting adds a single replacement to get a new replacement map.
 func (w *ReplaceMap) Inserting(newNode Node, newV Node) *ReplaceMap {
 	newCount := 1
 	if w != nil {
-		newCount += len(w.m)
+		newCount += len(w.entries)
 	}
-	result := &ReplaceMap{m: make(map[Node]Node, newCount)}
+	result := &ReplaceMap{entries: make([]replacement, 0, newCount)}
 	if w != nil {
-		for k, v := range w.m {
-			if k == newNode {
+		for _, e := range w.entries {
+			if e.old == newNode {
 				panic("overwriting key")
 			}
-			if v == newNode {
+			if e.new == newNode {
 				panic("insertion out of order")
 			}
-			result.m[k] = v
 		}
+		result.entries = append(result.entries, w.entries...)
 	}
-	result.m[newNode] = newV
+	result.entries = append(result.entries, replacement{old: newNode, new: newV})
 	return result
 }
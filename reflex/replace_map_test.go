@@ -0,0 +1,88 @@
+package reflex
+
+import "testing"
+
+func TestReplaceMapUpdating(t *testing.T) {
+	nodes := make([]Node, 5)
+	for i := range nodes {
+		nodes[i] = &NodeBlock{}
+	}
+	a, b, c, d, e := nodes[0], nodes[1], nodes[2], nodes[3], nodes[4]
+
+	makeMap := func(pairs ...Node) *ReplaceMap {
+		var r *ReplaceMap
+		for i := 0; i < len(pairs); i += 2 {
+			r = r.Inserting(pairs[i], pairs[i+1])
+		}
+		return r
+	}
+
+	testCases := []struct {
+		name     string
+		w        *ReplaceMap
+		update   *ReplaceMap
+		expected map[Node]Node
+	}{
+		{
+			name:     "NilBase",
+			w:        nil,
+			update:   makeMap(a, b),
+			expected: map[Node]Node{a: b},
+		},
+		{
+			name:     "NilUpdate",
+			w:        makeMap(a, b),
+			update:   nil,
+			expected: map[Node]Node{a: b},
+		},
+		{
+			name:     "Disjoint",
+			w:        makeMap(a, b),
+			update:   makeMap(c, d),
+			expected: map[Node]Node{a: b, c: d},
+		},
+		{
+			name:     "RedirectValue",
+			w:        makeMap(a, b, c, d),
+			update:   makeMap(b, e),
+			expected: map[Node]Node{a: e, c: d},
+		},
+		{
+			name:     "OverrideKey",
+			w:        makeMap(a, b, c, d),
+			update:   makeMap(a, e),
+			expected: map[Node]Node{a: e, c: d},
+		},
+		{
+			name:     "UpdateKeyIsValue",
+			w:        makeMap(a, b),
+			update:   makeMap(b, c, d, e),
+			expected: map[Node]Node{a: c, d: e},
+		},
+	}
+
+	for _, tc := range testCases {
+		t.Run(tc.name, func(t *testing.T) {
+			actual := tc.w.Updating(tc.update)
+			for _, k := range nodes {
+				v, ok := actual.Get(k)
+				expected, expectedOk := tc.expected[k]
+				if ok != expectedOk || v != expected {
+					t.Errorf(
+						"node %d: expected (%p, %v) but got (%p, %v)",
+						nodeIndex(nodes, k), expected, expectedOk, v, ok,
+					)
+				}
+			}
+		})
+	}
+}
+
+func nodeIndex(nodes []Node, n Node) int {
+	for i, x := range nodes {
+		if x == n {
+			return i
+		}
+	}
+	return -1
+}
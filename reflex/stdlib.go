@@ -62,11 +62,11 @@ func createFile(ctx *Context, f *os.File) Node {
 		ctx.Attrs.Get("result"): &NodeBuiltInOp{
 			NodeBase: NodeBase{P: pos},
 			Context:  write,
-			Op: newFnBuiltInOp(
+			Op: newEffectfulFnBuiltInOp(
 				ctx.Attrs,
 				[]string{"bytes._inner"},
-				func(args map[string]Node) (Node, error) {
-					x := args["bytes._inner"]
+				func(args []Node) (Node, error) {
+					x := args[0]
 					xValue, err := literalValue[[]byte](x)
 					if err != nil {
 						return nil, err
@@ -85,10 +85,10 @@ func createFile(ctx *Context, f *os.File) Node {
 		ctx.Attrs.Get("result"): &NodeBuiltInOp{
 			NodeBase: NodeBase{P: pos},
 			Context:  close,
-			Op: newFnBuiltInOp(
+			Op: newEffectfulFnBuiltInOp(
 				ctx.Attrs,
 				[]string{},
-				func(args map[string]Node) (Node, error) {
+				func(args []Node) (Node, error) {
 					err := f.Close()
 					return ctx.Maybe(pos, nil, err), nil
 				},
@@ -103,11 +103,11 @@ func createFile(ctx *Context, f *os.File) Node {
 		ctx.Attrs.Get("result"): &NodeBuiltInOp{
 			NodeBase: NodeBase{P: pos},
 			Context:  read,
-			Op: newFnBuiltInOp(
+			Op: newEffectfulFnBuiltInOp(
 				ctx.Attrs,
 				[]string{"n._inner"},
-				func(args map[string]Node) (Node, error) {
-					nNode := args["n._inner"]
+				func(args []Node) (Node, error) {
+					nNode := args[0]
 					n, err := literalValue[int64](nNode)
 					if err != nil {
 						return nil, err
@@ -1,6 +1,10 @@
 package reflex
 
-import "testing"
+import (
+	"io"
+	"os"
+	"testing"
+)
 
 func TestBuiltInList(t *testing.T) {
 	code := `
@@ -76,3 +80,37 @@ func TestBuiltInList(t *testing.T) {
 	`
 	testInterpreterOutput(t, code, "5,7,9")
 }
+
+func TestBuiltInIORepeated(t *testing.T) {
+	r, w, err := os.Pipe()
+	if err != nil {
+		t.Fatal(err)
+	}
+	defer r.Close()
+	defer w.Close()
+
+	// Redirect stdout before anything is evaluated.
+	ctx := NewContext()
+	ioNode := ctx.builtIns["io"]
+	ioNode.Defs = NewOverrideDefMap(ioNode.Defs, NewFlatDefMap(map[Attr]Node{
+		ctx.Attrs.Get("stdout"): createFile(ctx, w),
+	}))
+
+	// Each access to a runs the write again, even though it is the same
+	// attribute of the same block.
+	code := `
+		io = "stdlib/io".import
+		a = io.print(line:="hi")!
+		result = a.result + a.result
+	`
+	testInterpreterOutputContext[int64](t, ctx, code, 6)
+	w.Close()
+
+	data, err := io.ReadAll(r)
+	if err != nil {
+		t.Fatal(err)
+	}
+	if string(data) != "hi\nhi\n" {
+		t.Fatalf("unexpected output: %#v", string(data))
+	}
+}